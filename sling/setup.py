@@ -1,6 +1,5 @@
 import os, platform, pathlib
 from setuptools import setup
-from setuptools import find_packages
 
 
 SLING_VERSION = '0.0.0dev'
@@ -36,7 +35,7 @@ setup(
   keywords=['sling', 'etl', 'elt', 'extract', 'load'],
 
   # https://setuptools.pypa.io/en/latest/userguide/datafiles.html#subdirectory-for-data-files
-  packages=find_packages(exclude=['tests']),
+  packages=['sling'],
   long_description_content_type='text/markdown',
   long_description=README,
   include_package_data=True, # uses MANIFEST.in
@@ -1,8 +1,15 @@
 
-import os, sys, tempfile, uuid, json, platform, traceback
+import os, sys, tempfile, uuid, json, platform, traceback, functools
 from subprocess import PIPE, Popen, STDOUT
 from typing import Iterable, List, Union, Dict
 from json import JSONEncoder
+from enum import Enum
+
+# optional faster serializer for the config files
+try:
+  import orjson
+except ImportError:
+  orjson = None
 
 #################################################################
 # Logic to import the proper binary for the respective operating 
@@ -26,31 +33,59 @@ insert('sling-mac-arm64')
 SLING_BIN = os.getenv("SLING_BINARY")
 
 if not SLING_BIN:
-  if platform.system() == 'Linux':
+  if sys.platform.startswith('linux'):
     if platform.machine() == 'aarch64':
       exec('from sling_linux_arm64 import SLING_BIN')
     else:
       exec('from sling_linux_amd64 import SLING_BIN')
-  elif platform.system() == 'Windows':
+  elif sys.platform == 'win32':
     if platform.machine() == 'ARM64':
       exec('from sling_windows_arm64 import SLING_BIN')
     else:
       exec('from sling_windows_amd64 import SLING_BIN')
-  elif platform.system() == 'Darwin':
+  elif sys.platform == 'darwin':
     if platform.machine() == 'arm64':
       exec('from sling_mac_arm64 import SLING_BIN')
     else:
       exec('from sling_mac_amd64 import SLING_BIN')
 
+# buffer size for the subprocess pipes, fewer read syscalls on large outputs
+PIPE_BUFFER_SIZE = 1 << 20
+
+# chunk size used when draining the whole output with `os.read`
+PIPE_READ_SIZE = 1 << 16
+
 #################################################################
 
 is_package = lambda text: any([
     text in line.lower()
     for line in traceback.format_stack()[:-1]])
 
+def _to_dict(o):
+  "collects the slots of every class in the MRO, plus any attributes set outside of them"
+  # serialized like orjson does natively, so both paths write the same config
+  if isinstance(o, uuid.UUID):
+    return str(o)
+  if isinstance(o, Enum):
+    return o.value
+
+  if not hasattr(o, '__dict__') and not any('__slots__' in cls.__dict__ for cls in type(o).__mro__):
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+  data = {}
+  for cls in reversed(type(o).__mro__):
+    slots = cls.__dict__.get('__slots__', ())
+    if isinstance(slots, str):
+      slots = (slots,)
+    for k in slots:
+      if k not in ('__dict__', '__weakref__') and hasattr(o, k):
+        data[k] = getattr(o, k)
+  data.update(getattr(o, '__dict__', {}))
+  return data
+
 class JsonEncoder(JSONEncoder):
   def default(self, o):
-    return o.__dict__
+    return _to_dict(o)
 
 class HookMap:
   start: List[dict]
@@ -135,6 +170,8 @@ class SourceOptions:
     self.transforms = transforms
 
 class Source:
+  __slots__ = ('conn', 'stream', 'primary_key', 'update_key', 'limit', 'options', '__dict__')
+
   conn: str
   stream: str
   primary_key: List[str]
@@ -227,6 +264,8 @@ class TargetOptions:
     self.post_sql = post_sql
 
 class Target:
+  __slots__ = ('conn', 'object', 'options', '__dict__')
+
   conn: str
   object: str
   options: TargetOptions
@@ -245,6 +284,8 @@ class Target:
     self.options = options
 
 class TaskOptions:
+  __slots__ = ('stdout', 'debug', '__dict__')
+
   stdout: bool
   debug: bool
 
@@ -253,6 +294,13 @@ class TaskOptions:
     self.debug = kwargs.get('debug')
 
 class ReplicationStream:
+  __slots__ = (
+    'id', 'description', 'mode', 'object', 'select', 'where',
+    'primary_key', 'update_key', 'sql', 'tags', 'schedule',
+    'transforms', 'columns', 'hooks', 'source_options',
+    'target_options', 'disabled', '__dict__',
+  )
+
   id: str
   description: str
   mode: str
@@ -336,6 +384,10 @@ class Replication:
   `env` represents the environment variable to apply.
   `debug` represents the whether the logger should be set at DEBUG level.
   """
+  __slots__ = (
+    'source', 'target', 'defaults', 'hooks', 'streams', 'env', 'debug',
+    'file_path', 'temp_file', '__dict__',
+  )
 
   source: str
   target: str
@@ -371,11 +423,10 @@ class Replication:
     self.defaults = defaults
 
     if isinstance(streams, dict):
-      for key, replication in streams.items():
-        if isinstance(replication, dict):
-          replication = ReplicationStream(**replication)
-        streams[key] = replication
-        
+      streams = {
+        key: ReplicationStream(**stream) if isinstance(stream, dict) else stream
+        for key, stream in streams.items()
+      }
     self.streams = streams
     self.env = env
     self.debug = debug
@@ -410,16 +461,14 @@ class Replication:
     self.temp_file = os.path.join(temp_dir, f'sling-replication-{uid}.json')
 
     # dump config
-    with open(self.temp_file, 'w') as file:
-      config = dict(
-        source=self.source,
-        target=self.target,
-        defaults=self.defaults,
-        streams=self.streams,
-        env=self.env,
-      )
-
-      json.dump(config, file, cls=JsonEncoder)
+    config = dict(
+      source=self.source,
+      target=self.target,
+      defaults=self.defaults,
+      streams=self.streams,
+      env=self.env,
+    )
+    _write_config(self.temp_file, config)
     
     return f'{SLING_BIN} run {debug} -r "{self.temp_file}"'
   
@@ -436,6 +485,8 @@ class Pipeline:
   `env` represents the environment variables to apply.
   `file_path` represents the path to the pipeline YAML file.
   """
+  __slots__ = ('steps', 'env', 'file_path', 'temp_file', '__dict__')
+
   steps: List[dict]
   env: dict
   file_path: str
@@ -461,12 +512,11 @@ class Pipeline:
     self.temp_file = os.path.join(temp_dir, f'sling-pipeline-{uid}.yaml')
 
     # dump config
-    with open(self.temp_file, 'w') as file:
-      config = dict(
-        steps=self.steps,
-        env=self.env,
-      )
-      json.dump(config, file, cls=JsonEncoder)
+    config = dict(
+      steps=self.steps,
+      env=self.env,
+    )
+    _write_config(self.temp_file, config)
     
     return f'{SLING_BIN} run -p "{self.temp_file}"'
   
@@ -490,6 +540,8 @@ class Task:
   `replication` represents the replication object using the `Replication` class
   `options` represent the options object using the `Options` class.
   """
+  __slots__ = ('source', 'target', 'mode', 'options', 'env', 'temp_file', '__dict__')
+
   source: Source
   target: Target
   options: TaskOptions
@@ -529,16 +581,14 @@ class Task:
     self.temp_file = os.path.join(temp_dir, f'sling-task-{uid}.json')
 
     # dump config
-    with open(self.temp_file, 'w') as file:
-      config = dict(
-        source=self.source,
-        target=self.target,
-        mode=self.mode,
-        env=self.env,
-        options=self.options,
-      )
-
-      json.dump(config, file, cls=JsonEncoder)
+    config = dict(
+      source=self.source,
+      target=self.target,
+      mode=self.mode,
+      env=self.env,
+      options=self.options,
+    )
+    _write_config(self.temp_file, config)
 
     return f'{SLING_BIN} run -c "{self.temp_file}"'
   
@@ -555,9 +605,6 @@ class Task:
 
     lines = []
     try:
-      for k,v in os.environ.items():
-        env[k] = env.get(k, v)
-
       for stdout_line in _exec_cmd(cmd, env=env, stdin=stdin, stderr=PIPE):
         lines.append(stdout_line)
         if len(lines) > 20:
@@ -574,20 +621,40 @@ class Task:
 # conform to legacy module
 Sling = Task
 
+def _write_config(path: str, config: dict):
+  "serializes the config compactly and writes it to `path` in a single buffer"
+  data = None
+  if orjson:
+    try:
+      # stringify non-str keys like the stdlib does, and hand datetimes and
+      # dataclasses to _to_dict, so both paths accept the same values
+      option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+      data = orjson.dumps(config, default=_to_dict, option=option)
+    except orjson.JSONEncodeError:
+      pass # e.g. ints beyond 64 bits, which the stdlib path handles
+
+  if data is None:
+    data = json.dumps(config, cls=JsonEncoder, separators=(',', ':')).encode('utf-8')
+  flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+  fd = os.open(path, flags, 0o600)
+  try:
+    view = memoryview(data)
+    while view:
+      view = view[os.write(fd, view):]
+  finally:
+    os.close(fd)
+
 def _run(cmd: str, temp_file: str, return_output=False, env:dict=None, stdin=None):
   """
   Runs the task. Use `return_output` as `True` to return the stdout+stderr output at end. `env` accepts a dictionary which defines the environment.
   """
   lines = []
   try:
-    env = env or {}
-    for k,v in os.environ.items():
-      env[k] = env.get(k, v)
-
-    for line in _exec_cmd(cmd, env=env, stdin=stdin):
-      if return_output:
+    if return_output:
+      for line in _exec_cmd_bytes(cmd, env=env, stdin=stdin, buffered=True):
         lines.append(line)
-      else:
+    else:
+      for line in _exec_cmd(cmd, env=env, stdin=stdin):
         print(line, flush=True)
     
     os.remove(temp_file)
@@ -596,29 +663,40 @@ def _run(cmd: str, temp_file: str, return_output=False, env:dict=None, stdin=Non
     print(f'config file for debugging: {temp_file}')
 
     if return_output:
-      lines.append(str(E))
-      raise Exception('\n'.join(lines))
+      output = _decode(b'\n'.join(lines))
+      raise Exception(f'{output}\n{E}' if lines else str(E))
     raise E
 
   finally:
     pass
 
-  return '\n'.join(lines)
+  return _decode(b'\n'.join(lines))
+
+# commands whose output does not change for a given binary
+CACHED_CLI_ARGS = {('--version',), ('--help',), ('-h',)}
 
 def cli(*args, return_output=False):
   "calls the sling binary with the provided args"
-  args = args or sys.argv[1:]
+  args = tuple(args or sys.argv[1:])
+  if return_output and args in CACHED_CLI_ARGS:
+    return _cli_cached(SLING_BIN, args)
+  return _cli(args, return_output=return_output)
+
+@functools.lru_cache(maxsize=8)
+def _cli_cached(sling_bin: str, args: tuple):
+  return _cli(args, return_output=True, sling_bin=sling_bin)
+
+def _cli(args: tuple, return_output=False, sling_bin: str=None):
+  sling_bin = sling_bin or SLING_BIN
   escape = lambda a: a.replace('"', '\\"')
-  cmd = f'''{SLING_BIN} {" ".join([f'"{escape(a)}"' for a in args])}'''
+  cmd = f'''{sling_bin} {" ".join([f'"{escape(a)}"' for a in args])}'''
   lines = []
   try:
-    stdout = PIPE if return_output else sys.stdout
-    stderr = STDOUT if return_output else sys.stderr
-    env = { k: v for k,v in os.environ.items() }
-    for line in _exec_cmd(cmd, stdin=sys.stdin, stdout=stdout, stderr=stderr, env=env):
-      if return_output:
+    if return_output:
+      for line in _exec_cmd_bytes(cmd, stdin=sys.stdin, stdout=PIPE, stderr=STDOUT, buffered=True):
         lines.append(line)
-      else:
+    else:
+      for line in _exec_cmd(cmd, stdin=sys.stdin, stdout=sys.stdout, stderr=sys.stderr):
         print(line, flush=True)
   except Exception as E:
     if return_output:
@@ -627,33 +705,63 @@ def cli(*args, return_output=False):
       return 11
 
   if return_output:
-    return '\n'.join(lines)
+    return _decode(b'\n'.join(lines))
 
   return 0
 
 
+def _decode(data: bytes) -> str:
+  return str(data, 'utf-8', errors='replace')
+
 def _exec_cmd(cmd, stdin=None, stdout=PIPE, stderr=STDOUT, env:dict=None):
+  "Executes the command and yields the stdout lines as text."
+  for line in _exec_cmd_bytes(cmd, stdin=stdin, stdout=stdout, stderr=stderr, env=env):
+    yield _decode(line)
+
+def _exec_cmd_bytes(cmd, stdin=None, stdout=PIPE, stderr=STDOUT, env:dict=None, buffered=False):
+  """
+  Executes the command and yields the stdout lines as raw bytes. With `buffered` as `True`, the
+  output is drained in large chunks, for callers that only need it at the end.
+  """
   lines = []
 
-  env = env or {}
-  for k,v in os.environ.items():
-    env[k] = env.get(k, v)
+  # merge into a new dict, leaving the caller's env untouched
+  env = {**os.environ, **env} if env else dict(os.environ)
 
   env['SLING_PACKAGE'] = 'python'
   for pkg in ['dagster', 'airflow', 'temporal', 'orkes']:
     if is_package(pkg):
       env['SLING_PACKAGE'] = pkg
 
-  with Popen(cmd, shell=True, env=env, stdin=stdin, stdout=stdout, stderr=stderr) as proc:
-    if stdout and stdout != STDOUT and proc.stdout:
+  # on POSIX, skip the close_fds sweep over every fd up to the rlimit (costly on
+  # older Pythons). fds are non-inheritable by default (PEP 446), only ones a
+  # parent explicitly marked inheritable are passed down to sling.
+  close_fds = os.name != 'posix'
+
+  with Popen(cmd, shell=True, env=env, stdin=stdin, stdout=stdout, stderr=stderr, bufsize=PIPE_BUFFER_SIZE, close_fds=close_fds) as proc:
+    if stdout and stdout != STDOUT and proc.stdout and buffered:
+      buf = bytearray()
+      fd = proc.stdout.fileno()
+      while True:
+        chunk = os.read(fd, PIPE_READ_SIZE)
+        if not chunk:
+          break
+        buf += chunk
+
+      if buf.endswith(b'\n'):
+        del buf[-1:]
+      if buf:
+        for line in buf.split(b'\n'):
+          yield bytes(line.strip())
+
+    elif stdout and stdout != STDOUT and proc.stdout:
       for line in proc.stdout:
-        line = str(line.strip(), 'utf-8', errors='replace')
-        yield line
+        yield line.strip()
 
     proc.wait()
 
     if stderr and stderr != STDOUT and proc.stderr:
-      lines = '\n'.join(list(proc.stderr))
+      lines = _decode(proc.stderr.read()).strip()
 
     if proc.returncode != 0:
       if len(lines) > 0:
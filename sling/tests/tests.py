@@ -1,6 +1,18 @@
-import os
+import os, sys, json, tempfile, uuid
+from subprocess import PIPE
+from datetime import datetime
 import pytest
-from sling import Replication, ReplicationStream, Pipeline
+import sling
+from sling import Replication, ReplicationStream, Pipeline, Task, Sling, Source, JsonEncoder, _exec_cmd
+
+_CMD_REPL_D = "run -d -r"
+_CMD_PIPE = "run -p"
+_CMD_TASK = "run -c"
+
+@pytest.fixture(autouse=True)
+def _configs_in_tmp_path(tmp_path, monkeypatch):
+    # config files written by `_prep_cmd` land in the per-test tmp_path
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
 
 def test_replication_stream():
     # Test basic initialization
@@ -27,9 +39,43 @@ def test_replication_stream():
     stream.enable()
     assert stream.disabled == False
 
-def test_replication():
-    # Test basic initialization
-    replication = Replication(
+    # Test serialization of slotted objects
+    config = json.loads(json.dumps(stream, cls=JsonEncoder))
+    assert config["object"] == "schema.table"
+    assert config["source_options"]["header"] == True
+    assert config["target_options"]["batch_limit"] == 1000
+
+    # keys not modeled by the class still reach the config
+    stream.single = True
+    config = json.loads(json.dumps(stream, cls=JsonEncoder))
+    assert config["single"] == True
+    assert config["object"] == "schema.table"
+
+def test_replication_stream_unserializable():
+    stream = ReplicationStream(object="schema.table", primary_key={"id"})
+    with pytest.raises(TypeError, match="Object of type set is not JSON serializable"):
+        json.dumps(stream, cls=JsonEncoder)
+
+def test_replication_stream_subclass():
+    class SlottedStream(ReplicationStream):
+        __slots__ = ()
+
+    class CustomStream(ReplicationStream):
+        def __init__(self, owner: str = None, **kwargs):
+            super().__init__(**kwargs)
+            self.owner = owner
+
+    config = json.loads(json.dumps(SlottedStream(object="schema.table"), cls=JsonEncoder))
+    assert config["object"] == "schema.table"
+    assert config["disabled"] == None
+
+    config = json.loads(json.dumps(CustomStream(owner="ops", mode="incremental"), cls=JsonEncoder))
+    assert config["owner"] == "ops"
+    assert config["mode"] == "incremental"
+
+@pytest.fixture
+def basic_replication():
+    return Replication(
         source="postgres",
         target="snowflake",
         defaults=ReplicationStream(mode="full-refresh"),
@@ -48,6 +94,8 @@ def test_replication():
         debug=True
     )
 
+def test_replication_init(basic_replication):
+    replication = basic_replication
     assert replication.source == "postgres"
     assert replication.target == "snowflake"
     assert replication.defaults.mode == "full-refresh"
@@ -56,7 +104,21 @@ def test_replication():
     assert replication.debug == True
     assert replication.streams["stream2"].disabled == True
 
-    # Test stream management
+def test_replication_dict_streams():
+    streams = {"public.users": {"object": "db.users", "mode": "full-refresh"}}
+    replication = Replication(source="postgres", target="snowflake", streams=streams)
+
+    stream = replication.streams["public.users"]
+    assert isinstance(stream, ReplicationStream)
+    assert stream.object == "db.users"
+    assert isinstance(streams["public.users"], dict)
+
+    # default streams are not shared between instances
+    replication.add_streams({"public.orders": ReplicationStream(object="db.orders")})
+    assert len(Replication().streams) == 0
+
+def test_replication_add_streams(basic_replication):
+    replication = basic_replication
     replication.add_streams({
         "stream3": ReplicationStream(
             object="schema.table3",
@@ -64,26 +126,31 @@ def test_replication():
         )
     })
     assert len(replication.streams) == 3
+    assert replication.streams["stream3"].disabled == None
 
+def test_replication_disable_streams(basic_replication):
+    replication = basic_replication
     replication.disable_streams(["stream1", "stream2"])
     assert replication.streams["stream1"].disabled == True
     assert replication.streams["stream2"].disabled == True
-    assert replication.streams["stream3"].disabled == None
 
     replication.enable_streams(["stream1"])
     assert replication.streams["stream1"].disabled == False
     assert replication.streams["stream2"].disabled == True
 
-    # Test mode setting
+def test_replication_default_mode(basic_replication):
+    replication = basic_replication
     replication.set_default_mode("incremental")
     assert replication.defaults.mode == "incremental"
 
-    # Test command preparation
+def test_replication_prep_cmd(basic_replication, tmp_path):
+    replication = basic_replication
     cmd = replication._prep_cmd()
-    assert "run -d -r" in cmd
+    assert _CMD_REPL_D in cmd
     assert replication.temp_file.endswith(".json")
+    assert os.path.dirname(replication.temp_file) == str(tmp_path)
 
-def test_pipeline():
+def test_pipeline(tmp_path):
     # Test basic initialization
     pipeline = Pipeline(
         steps=[
@@ -109,22 +176,126 @@ def test_pipeline():
 
     # Test command preparation
     cmd = pipeline._prep_cmd()
-    assert "run -p" in cmd
+    assert _CMD_PIPE in cmd
     assert pipeline.temp_file.endswith(".yaml")
+    assert os.path.dirname(pipeline.temp_file) == str(tmp_path)
 
 @pytest.fixture
-def cleanup_temp_files():
-    yield
-    # Cleanup any temporary files after tests
-    temp_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    for file in os.listdir(temp_dir):
-        if file.startswith('sling-') and (file.endswith('.json') or file.endswith('.yaml')):
-            try:
-                os.remove(os.path.join(temp_dir, file))
-            except:
-                pass
-
-@pytest.mark.usefixtures("cleanup_temp_files")
+def basic_task():
+    return Task(
+        source={"conn": "postgres", "stream": "public.users", "primary_key": ["id"]},
+        target={"conn": "snowflake", "object": "public.users", "options": {"column_casing": "snake"}},
+        options={"debug": True},
+    )
+
+def test_task_init(basic_task):
+    task = basic_task
+    assert task.source.stream == "public.users"
+    assert task.source.primary_key == ["id"]
+    assert task.target.options.column_casing == "snake"
+    assert task.options.debug == True
+
+def test_task_subclass():
+    # the legacy Sling alias can still be subclassed and extended
+    class CustomTask(Sling):
+        pass
+
+    custom = CustomTask(source={"conn": "postgres"}, target={"conn": "snowflake"})
+    custom.retries = 3
+    assert custom.retries == 3
+    assert custom.source.conn == "postgres"
+
+def test_task_extra_attributes_serialization(basic_task):
+    # attributes the classes don't list still serialize, also from subclasses
+    class CustomSource(Source):
+        __slots__ = ()
+
+    task = basic_task
+    task.source = CustomSource(conn="postgres", stream="public.users")
+    task.source.options.sheet = "Sheet1"
+    task.target.mode_override = "truncate"
+
+    task._prep_cmd()
+    with open(task.temp_file) as file:
+        config = json.load(file)
+    assert config["source"]["stream"] == "public.users"
+    assert config["source"]["options"]["sheet"] == "Sheet1"
+    assert config["target"]["mode_override"] == "truncate"
+
+def test_task_prep_cmd(basic_task, tmp_path):
+    task = basic_task
+    cmd = task._prep_cmd()
+    assert _CMD_TASK in cmd
+    assert os.path.dirname(task.temp_file) == str(tmp_path)
+    with open(task.temp_file) as file:
+        config = json.load(file)
+    assert config["source"]["primary_key"] == ["id"]
+    assert config["target"]["options"]["column_casing"] == "snake"
+    assert config["options"] == {"stdout": None, "debug": True}
+
+    # each run gets its own config file
+    temp_file = task.temp_file
+    task._prep_cmd()
+    assert task.temp_file != temp_file
+    assert os.path.exists(temp_file)
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def use_orjson(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(sling, 'orjson', None)
+    elif sling.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+def test_write_config(use_orjson, tmp_path):
+    stream = ReplicationStream(object="schema.table", source_options={"columns": {1: "int"}})
+    path = str(tmp_path / "config.json")
+    uid = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    sling._write_config(path, dict(streams={"stream1": stream}, env={"BIG": 2**70, "RUN_ID": uid}))
+
+    with open(path) as file:
+        config = json.load(file)
+    assert config["streams"]["stream1"]["object"] == "schema.table"
+    assert config["streams"]["stream1"]["source_options"]["columns"] == {"1": "int"}
+    assert config["env"]["BIG"] == 2**70
+    assert config["env"]["RUN_ID"] == "12345678-1234-5678-1234-567812345678"
+
+@pytest.mark.parametrize("value", [datetime(2020, 1, 1), {"id"}], ids=["datetime", "set"])
+def test_write_config_unserializable(use_orjson, tmp_path, value):
+    with pytest.raises(TypeError):
+        sling._write_config(str(tmp_path / "config.json"), dict(env={"VALUE": value}))
+
+def test_exec_cmd_env(monkeypatch):
+    monkeypatch.setenv("EXISTING_VAR", "existing")
+    env = {"MY_VAR": "value"}
+    lines = list(_exec_cmd('echo "$EXISTING_VAR $MY_VAR $SLING_PACKAGE"', env=env))
+    assert lines == ["existing value python"]
+    assert env == {"MY_VAR": "value"}
+
+def test_exec_cmd_stderr_pipe():
+    # stderr captured with PIPE (as `Task.stream` does) ends up in the error message
+    with pytest.raises(Exception) as exc_info:
+        list(_exec_cmd('echo boom >&2; exit 1', stderr=PIPE))
+    assert str(exc_info.value) == 'Sling command failed:\nboom'
+
+def test_cli_cached_output(monkeypatch):
+    monkeypatch.setattr(sling, 'SLING_BIN', 'echo')
+    monkeypatch.setattr(sys, 'stdin', None)
+    hits = sling._cli_cached.cache_info().hits
+
+    assert sling.cli("--version", return_output=True) == "--version"
+    assert sling.cli("--version", return_output=True) == "--version"
+    assert sling._cli_cached.cache_info().hits == hits + 1
+
+    # the cache is keyed on the binary too
+    monkeypatch.setattr(sling, 'SLING_BIN', 'echo v2')
+    assert sling.cli("--version", return_output=True) == "v2 --version"
+
+    # other commands are not cached
+    size = sling._cli_cached.cache_info().currsize
+    assert sling.cli("conns", "list", return_output=True) == "v2 conns list"
+    assert sling._cli_cached.cache_info().currsize == size
+
 def test_run_methods(monkeypatch):
     # Test Replication run
     replication = Replication(
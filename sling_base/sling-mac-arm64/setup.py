@@ -1,7 +1,27 @@
 import os, pathlib
 from setuptools import setup
-from setuptools import find_packages
-from sling_mac_arm64 import SLING_VERSION
+from setuptools.command.build_py import build_py
+
+SLING_VERSION = '0.0.0dev'
+
+version_path = pathlib.Path(os.path.join(os.path.dirname(__file__), 'sling_mac_arm64', 'bin', 'VERSION'))
+if version_path.exists():
+  with version_path.open() as file:
+    SLING_VERSION = file.read().strip()
+
+class BuildPy(build_py):
+  "bakes the version into the built package only, so the import needs no file read"
+  def run(self):
+    super().run()
+
+    # editable installs import from the source tree, which reads bin/VERSION
+    if self.dry_run or getattr(self, 'editable_mode', False):
+      return
+
+    package_dir = os.path.join(self.build_lib, 'sling_mac_arm64')
+    os.makedirs(package_dir, exist_ok=True)
+    with open(os.path.join(package_dir, '_version.py'), 'w') as file:
+      file.write(f'SLING_VERSION = {SLING_VERSION!r}\n')
 
 README = 'dev'
 readme_path = pathlib.Path(os.path.join(os.path.dirname(__file__), 'README.md'))
@@ -20,13 +40,14 @@ setup(
   keywords=['sling', 'etl', 'elt', 'extract', 'load'],
 
   # https://setuptools.pypa.io/en/latest/userguide/datafiles.html#subdirectory-for-data-files
-  packages=find_packages(exclude=['tests']),
+  packages=['sling_mac_arm64'],
   long_description_content_type='text/markdown',
   long_description=README,
   include_package_data=True, # uses MANIFEST.in
   install_requires=[],
   extras_require={},
   entry_points={},
+  cmdclass={'build_py': BuildPy},
   classifiers=[
     'Programming Language :: Python :: 3', 'Intended Audience :: Developers',
     'Intended Audience :: Education', 'Intended Audience :: Science/Research',
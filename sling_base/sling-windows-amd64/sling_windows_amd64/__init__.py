@@ -1,20 +1,31 @@
 
-import os, platform, pathlib
+import os, sys, platform
 
 # set binary
 BIN_FOLDER = os.path.join(os.path.dirname(__file__), 'bin')
 
-if platform.system() == 'Windows':
-  if platform.machine() == 'ARM64':
-    SLING_BIN = os.path.join(BIN_FOLDER,'sling-win-arm64.exe')
-  else:
-    SLING_BIN = os.path.join(BIN_FOLDER,'sling-win-amd64.exe')
+# binary per machine name (upper-cased), defaults to amd64
+BIN_MAP = {
+  'ARM64': 'sling-win-arm64.exe',
+  'AARCH64': 'sling-win-arm64.exe',
+}
+
+if sys.platform == 'win32':
+  SLING_BIN = os.path.join(BIN_FOLDER, BIN_MAP.get(platform.machine().upper(), 'sling-win-amd64.exe'))
 else:
   SLING_BIN = ''
 
-SLING_VERSION = '0.0.0dev'
+try:
+  # written by setup.py at build time
+  from ._version import SLING_VERSION
+except ImportError:
+  SLING_VERSION = '0.0.0dev'
 
-version_path = pathlib.Path(os.path.join(BIN_FOLDER,'VERSION'))
-if version_path.exists():
-  with version_path.open() as file:
-    SLING_VERSION = file.read().strip()
\ No newline at end of file
+  try:
+    _fd = os.open(os.path.join(BIN_FOLDER,'VERSION'), os.O_RDONLY)
+    try:
+      SLING_VERSION = os.read(_fd, 64).decode().strip() or SLING_VERSION
+    finally:
+      os.close(_fd)
+  except OSError:
+    pass
\ No newline at end of file